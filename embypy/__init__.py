@@ -35,3 +35,4 @@ else:
 import embypy.utils
 import embypy.objects
 from embypy.emby import Emby
+from embypy.utils.asyncio import enable_uvloop
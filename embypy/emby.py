@@ -1,8 +1,105 @@
-from simplejson.scanner import JSONDecodeError
+import asyncio
+import logging
+from json import JSONDecodeError
+from operator import itemgetter
+from types import MappingProxyType
 
 from embypy import objects
 from embypy.utils import Connector
-from embypy.utils.asyncio import async_func
+from embypy.utils.asyncio import async_func, enable_uvloop
+
+
+_ITEMS_PATH = '/Users/{UserId}/Items'
+_BASE_QUERY = MappingProxyType({
+    'remote'    : False,
+    'format'    : 'json',
+    'Recursive' : 'true',
+    'SortBy'    : 'SortName',
+    'SortOrder' : 'Ascending',
+})
+_ALBUMS_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'MusicAlbum',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags,Artists',
+})
+_SONGS_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'Audio',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags,Artists',
+})
+_PLAYLISTS_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'Playlist',
+    'Fields'           : 'Path,ParentId,Overview',
+})
+_ARTISTS_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'MusicArtist',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags',
+})
+_MOVIES_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'Movie',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags,ProviderIds',
+})
+_SERIES_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'Series',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags',
+})
+_EPISODES_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : 'Episode',
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags',
+})
+
+# albums, artists and songs come from the same endpoint, so `prefetch_all`
+#   gets them with one query (using the union of their fields)
+_MUSIC_KEYS = MappingProxyType({
+    'MusicAlbum'  : 'albums',
+    'MusicArtist' : 'artists',
+    'Audio'       : 'songs',
+})
+_MUSIC_QUERY = MappingProxyType({
+    **_BASE_QUERY,
+    'IncludeItemTypes' : ','.join(_MUSIC_KEYS),
+    'Fields'           : 'Path,ParentId,Overview,Genres,Tags,Artists',
+})
+
+# the list endpoint only sends the fields asked for, these match what the
+#   single item endpoint (used by `EmbyObject.update`) returns
+_INFO_FIELDS = ','.join((
+    'Path',
+    'ParentId',
+    'Overview',
+    'Genres',
+    'Tags',
+    'ProviderIds',
+    'People',
+    'Studios',
+    'Taglines',
+    'Chapters',
+    'MediaSources',
+    'MediaStreams',
+    'DateCreated',
+    'SortName',
+    'PrimaryImageAspectRatio',
+))
+
+# properties that (re)load the lists cached in `Emby.extras`
+_FORCE_KEYS = frozenset((
+    'albums_force',
+    'songs_force',
+    'artists_force',
+    'movies_force',
+    'series_force',
+    'episodes_force',
+    'playlists_force',
+    'devices_force',
+    'users_force',
+))
+
+logger = logging.getLogger(__name__)
 
 
 class Emby(objects.EmbyObject):
@@ -24,15 +121,41 @@ class Emby(objects.EmbyObject):
     password : str, optional
       password for user to login as
 
+    session : aiohttp.ClientSession, optional
+      session to share for all requests, if not given one is created
+      on first use and kept open until `aclose` is called
+    concurrency : int, optional
+      max number of requests to send to emby at once (default 16)
+    prefer_uvloop : bool, optional
+      if true, use uvloop's event loop when it is installed
+      (see `embypy.enable_uvloop`), has no effect (besides a warning)
+      if `Emby` is created inside a running event loop
+
     Attributes
     ----------
     connector : embypy.utils.connector.Connector
       Object used to make api requests, do not use
     '''
     def __init__(self, url, **kargs):
+        if kargs.get('prefer_uvloop'):
+            enable_uvloop()
         connector = Connector(url, **kargs)
         super().__init__({'ItemId': '', 'Name': ''}, connector)
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @async_func
+    async def aclose(self):
+        '''close the http session(s) used to talk to emby
+
+        |coro|
+        '''
+        await self.connector.aclose()
+
     @async_func
     async def info(self, obj_id=None):
         '''Get info about object id
@@ -46,6 +169,30 @@ class Emby(objects.EmbyObject):
           Otherwise, an object with that id is returned
           (or objects if `obj_id` is a list).
         '''
+        if isinstance(obj_id, (list, tuple, set)):
+            # fetch unknown ids in one request, instead of one each
+            missing = [
+                i for i in obj_id
+                if type(i) == str and i not in self.known_objects
+            ]
+            if missing:
+                # only a shortcut, if it fails the ids are looked up
+                #   one by one (by `process`) like before
+                try:
+                    json = await self.connector.getJson(
+                        _ITEMS_PATH,
+                        remote = False,
+                        Ids    = ','.join(missing),
+                        Fields = _INFO_FIELDS,
+                    )
+                    self.process_batch(json)
+                except Exception as e:
+                    logger.warning(
+                        'batched lookup of %d ids failed, '
+                        'looking them up one by one: %r', len(missing), e
+                    )
+            obj_id = list(obj_id)
+
         if obj_id:
             try:
                 return await self.process(obj_id)
@@ -83,6 +230,11 @@ class Emby(objects.EmbyObject):
         -------
         list
           list of emby objects
+
+        Notes
+        -----
+        The objects are built from the search hints, which only hold a few
+        fields. Use `EmbyObject.update` to load the rest when it is needed.
         '''
         search_params = {
             'remote'     : False,
@@ -92,12 +244,18 @@ class Emby(objects.EmbyObject):
             search_params['IncludeItemTypes'] = ','.join(sort_map.keys())
 
         json = await self.connector.getJson('/Search/Hints/', **search_params)
-        items = await self.process(json["SearchHints"])
+        items = self.process_batch(json["SearchHints"])
 
+        if strict_sort:
+            items = [item for item in items if item.type in sort_map]
+
+        # look each type up once, rather than on every comparison
+        get = sort_map.get
         m_size = len(sort_map)
-        items = sorted(items, key=lambda x: sort_map.get(x.type, m_size))
+        keyed = [(get(item.type, m_size), item) for item in items]
+        keyed.sort(key=itemgetter(0))
 
-        return items
+        return [item for _, item in keyed]
 
     @async_func
     async def latest(self, userId=None, itemTypes='', groupItems=False):
@@ -168,15 +326,62 @@ class Emby(objects.EmbyObject):
         Thus it is recomended to use the `*_force` properties, which will
         only update the cache after data is retrived.
         '''
-        keys = self.extras.keys()
+        keys = [
+            key + '_force' for key in self.extras
+            if key + '_force' in _FORCE_KEYS
+        ]
         self.extras = {}
-        for key in keys:
-            try:
-                func = getattr(self, key, None)
-                if callable(func):
-                    func()
-            except:
-                pass
+
+        # reload albums/artists/songs with one query if more than one is needed
+        music = [
+            key for key in keys
+            if key[:-len('_force')] in _MUSIC_KEYS.values()
+        ]
+        if len(music) > 1:
+            keys = [key for key in keys if key not in music]
+        else:
+            music = []
+
+        coros = [getattr(self, key) for key in keys]
+        if music:
+            keys.append('_music_force')
+            coros.append(self._music_force())
+
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                logger.warning('could not update %s: %r', key, result)
+
+    @async_func
+    async def prefetch_all(self):
+        '''load all of the cached lists at once
+
+        |coro|
+
+        Notes
+        -----
+        The requests are sent concurrently, so this is much faster than
+        going through the properties one by one.
+        Albums, artists and songs are loaded with a single request.
+        '''
+        await asyncio.gather(
+            self._music_force(),
+            self.movies_force,
+            self.series_force,
+            self.episodes_force,
+            self.playlists_force,
+            self.devices_force,
+            self.users_force,
+        )
+
+    async def _music_force(self):
+        items = {key: [] for key in _MUSIC_KEYS.values()}
+        query = self._stream_process(_ITEMS_PATH, **_MUSIC_QUERY)
+        async for item in query:
+            key = _MUSIC_KEYS.get(item.type)
+            if key:
+                items[key].append(item)
+        self.extras.update(items)
 
     @async_func
     async def create_playlist(self, name, *songs):
@@ -224,17 +429,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def albums_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'MusicAlbum',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags,Artists',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_ALBUMS_QUERY)
+        ]
         self.extras['albums'] = items
         return items
 
@@ -257,17 +455,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def songs_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'Audio',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags,Artists',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_SONGS_QUERY)
+        ]
         self.extras['songs'] = items
         return items
 
@@ -290,17 +481,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def playlists_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'Playlist',
-            Fields            = 'Path,ParentId,Overview',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_PLAYLISTS_QUERY)
+        ]
         self.extras['playlists'] = items
         return items
 
@@ -323,17 +507,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def artists_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'MusicArtist',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_ARTISTS_QUERY)
+        ]
         self.extras['artists'] = items
         return items
 
@@ -356,17 +533,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def movies_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'Movie',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags,ProviderIds',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_MOVIES_QUERY)
+        ]
         self.extras['movies'] = items
         return items
 
@@ -389,17 +559,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def series_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'Series',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_SERIES_QUERY)
+        ]
         self.extras['series'] = items
         return items
 
@@ -422,17 +585,10 @@ class Emby(objects.EmbyObject):
     @property
     @async_func
     async def episodes_force(self):
-        items = await self.connector.getJson(
-            '/Users/{UserId}/Items',
-            remote            = False,
-            format            = 'json',
-            Recursive         = 'true',
-            IncludeItemTypes  = 'Episode',
-            Fields            = 'Path,ParentId,Overview,Genres,Tags',
-            SortBy            = 'SortName',
-            SortOrder         = 'Ascending'
-        )
-        items = await self.process(items)
+        items = [
+            item async for item in
+            self._stream_process(_ITEMS_PATH, **_EPISODES_QUERY)
+        ]
         self.extras['episodes'] = items
         return items
 
@@ -456,7 +612,7 @@ class Emby(objects.EmbyObject):
     @async_func
     async def devices_force(self):
         items = await self.connector.getJson('/Devices', remote=False)
-        items = await self.process(items)
+        items = self.process_batch(items)
         self.extras['devices'] = items
         return items
 
@@ -480,6 +636,6 @@ class Emby(objects.EmbyObject):
     @async_func
     async def users_force(self):
         items = await self.connector.getJson('/Users', remote=False)
-        items = await self.process(items)
+        items = self.process_batch(items)
         self.extras['users'] = items
         return items
@@ -6,3 +6,29 @@ from embypy.objects.misc    import *
 
 from embypy.objects.object  import *
 
+# emby item type -> class that represents it, see `EmbyObject.process`
+_TYPE_MAP = {
+    'Audio': Audio,
+    'Person': Person,
+    'Video': Video,
+    'Movie': Movie,
+    'Trailer': Trailer,
+    'AdultVideo': AdultVideo,
+    'MusicVideo': MusicVideo,
+    'Episode': Episode,
+    'Folder': Folder,
+    'Playlist': Playlist,
+    'BoxSet': BoxSet,
+    'MusicAlbum': MusicAlbum,
+    'MusicArtist': MusicArtist,
+    'Season': Season,
+    'Series': Series,
+    'Game': Game,
+    'GameSystem': GameSystem,
+    'Photo': Photo,
+    'Book': Book,
+    'Image': Image,
+    'Device': Device,
+    'User': User,
+    'Default': EmbyObject,
+}
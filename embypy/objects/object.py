@@ -1,3 +1,7 @@
+import asyncio
+from functools import cached_property
+
+import embypy.objects as _objects
 from embypy.utils.asyncio import async_func
 
 
@@ -15,6 +19,9 @@ class EmbyObject(object):
       saves space/increases speed/reduces issues
       only set to false if creating a temp object that will be thrown out
     '''
+    # subclasses keep a __dict__, `cached_property` needs one
+    __slots__ = ('connector', 'object_dict', 'extras')
+
     known_objects = {}
 
     def __init__(self, object_dict, connector, save=True):
@@ -24,6 +31,15 @@ class EmbyObject(object):
         if save:
             EmbyObject.known_objects[object_dict.get('Id')] = self
 
+    def _clear_cache(self):
+        '''[for internal use] forget cached property values,
+        should be called whenever `object_dict` is changed upstream
+        '''
+        for cls in type(self).__mro__:
+            for name, attr in vars(cls).items():
+                if isinstance(attr, cached_property):
+                    self.__dict__.pop(name, None)
+
     def __eq__(self, other):
         return isinstance(other, EmbyObject) and self.id == other.id
 
@@ -280,6 +296,7 @@ class EmbyObject(object):
         )
         self.object_dict.update(info)
         self.extras = {}
+        self._clear_cache()
         return self
 
     @async_func
@@ -368,12 +385,7 @@ class EmbyObject(object):
                 if existing:
                     return existing
 
-                obj = EmbyObject(
-                    {"Id": object_dict},
-                    self.connector,
-                    save=False
-                )
-                object_dict = (await obj.update()).object_dict
+                object_dict = await self._lookup(object_dict)
         except:
             return None
 
@@ -393,14 +405,52 @@ class EmbyObject(object):
         if type(object_dict) == list:
             items = []
             for item in object_dict:
-                item = await self.process(item)
+                # dicts need no requests, so skip the extra coroutine
+                if type(item) == dict:
+                    item = self._process_dict(item)
+                else:
+                    item = await self.process(item)
                 if item:
                     items.append(item)
             return items
 
         # otherwise we probably have an object dict
         #   so we should process that
+        return self._process_dict(object_dict)
+
+    async def _lookup(self, obj_id):
+        # concurrent lookups of the same id (e.g. the series of every
+        #   episode in a list) share a single request
+        lookups = self.connector._lookups
+        task = lookups.get(obj_id)
+        if not task:
+            obj = EmbyObject({"Id": obj_id}, self.connector, save=False)
+            task = asyncio.ensure_future(obj.update())
+            task.add_done_callback(lambda _: lookups.pop(obj_id, None))
+            lookups[obj_id] = task
+        return (await asyncio.shield(task)).object_dict
+
+    def process_batch(self, object_dicts):
+        '''[for internal use] convert a list of json dicts into python objects
 
+        Unlike `process` no requests are made, so this is not a coroutine.
+
+        Parameters
+        ----------
+        object_dicts : list
+          json representations of objects from emby
+          (a dict with an `Items` list is accepted too)
+
+        Returns
+        -------
+        list
+          of the objects represented by the json dicts
+        '''
+        if type(object_dicts) == dict:
+            object_dicts = object_dicts.get('Items', [])
+        return [item for item in map(self._process_dict, object_dicts) if item]
+
+    def _process_dict(self, object_dict):
         # if dict has no id, it's a fake
         if 'Id' not in object_dict and 'ItemId' not in object_dict:
             return object_dict
@@ -411,12 +461,9 @@ class EmbyObject(object):
         existing = EmbyObject.known_objects.get(itemId)
         if existing:
             existing.object_dict.update(object_dict)
+            existing._clear_cache()
             return existing
 
-        import embypy.objects.folders
-        import embypy.objects.videos
-        import embypy.objects.misc
-
         # if object is not already stored,
         #   figure out its type (if unknown use this base class)
         #   create an object with subclass of that type
@@ -426,35 +473,28 @@ class EmbyObject(object):
         elif 'HasPassword' in object_dict:
             object_dict['Type'] = 'User'
 
-        objects = {
-            'Audio': embypy.objects.misc.Audio,
-            'Person': embypy.objects.misc.Person,
-            'Video': embypy.objects.videos.Video,
-            'Movie': embypy.objects.videos.Movie,
-            'Trailer': embypy.objects.videos.Trailer,
-            'AdultVideo': embypy.objects.videos.AdultVideo,
-            'MusicVideo': embypy.objects.videos.MusicVideo,
-            'Episode': embypy.objects.videos.Episode,
-            'Folder': embypy.objects.folders.Folder,
-            'Playlist': embypy.objects.folders.Playlist,
-            'BoxSet': embypy.objects.folders.BoxSet,
-            'MusicAlbum': embypy.objects.folders.MusicAlbum,
-            'MusicArtist': embypy.objects.folders.MusicArtist,
-            'Season': embypy.objects.folders.Season,
-            'Series': embypy.objects.folders.Series,
-            'Game': embypy.objects.misc.Game,
-            'GameSystem': embypy.objects.folders.GameSystem,
-            'Photo': embypy.objects.misc.Photo,
-            'Book': embypy.objects.misc.Book,
-            'Image': embypy.objects.misc.Image,
-            'Device': embypy.objects.misc.Device,
-            'User': embypy.objects.misc.User,
-            'Default': EmbyObject,
-        }
-        return objects.get(
-            object_dict.get('Type', 'Default'),
-            EmbyObject
-        )(object_dict, self.connector)
+        cls = _objects._TYPE_MAP.get(object_dict.get('Type'), EmbyObject)
+        return cls(object_dict, self.connector)
+
+    async def _stream_process(self, path, **query):
+        '''[for internal use] stream objects from an items request
+
+        Parameters
+        ----------
+        path : str
+          same as for `Connector.stream_items`
+        query : kargs dict
+          same as for `Connector.stream_items`
+
+        Yields
+        ------
+        EmbyObject
+          the objects, processed as soon as they are parsed
+        '''
+        async for object_dict in self.connector.stream_items(path, **query):
+            item = self._process_dict(object_dict)
+            if item:
+                yield item
 
     def __str__(self):
         return self.name
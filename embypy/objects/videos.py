@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from embypy.objects.object import EmbyObject
 from embypy.utils.asyncio import async_func
 
@@ -13,24 +15,23 @@ class Video(EmbyObject):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
-
-    @property
+    @cached_property
     def aspect_ratio(self):
         '''aspect ratio of the video'''
         return self.object_dict.get('AspectRatio', 0.0)
 
-    @property
+    @cached_property
     def chapters(self):
         '''chapters included in the video file'''
         return self.object_dict.get('Chapters')
 
-    @property
+    @cached_property
     def stream_url(self):
         '''stream url (as an mp4)'''
-        path = '/Videos/{}/stream.mp4'.format(self.id)
-        return self.connector.get_url(path, attach_api_key=False)
+        return self.connector.get_url(
+            f'/Videos/{self.id}/stream.mp4',
+            attach_api_key=False
+        )
 
 
 # Videos
@@ -44,10 +45,7 @@ class Movie(Video):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
-
-    @property
+    @cached_property
     def premiere_date(self):
         '''date that the movie permiered'''
         return self.object_dict.get('PremiereDate')
@@ -63,10 +61,7 @@ class Episode(Video):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
-
-    @property
+    @cached_property
     def premiere_date(self):
         '''date that the episode permiered'''
         return self.object_dict.get('PremiereDate')
@@ -121,7 +116,7 @@ class Episode(Video):
         '''
         return await self.process(self.season_id)
 
-    @property
+    @cached_property
     def series_id(self):
         '''The emby id of the series this episode belongs to'''
         return self.object_dict.get('SeriesId')
@@ -144,12 +139,12 @@ class Episode(Video):
     async def show(self):
         return await self.series
 
-    @property
+    @cached_property
     def series_name(self):
         '''name of the season'''
         return self.object_dict.get('SeriesName')
 
-    @property
+    @cached_property
     def genres(self):
         '''genres for the show'''
         return self.object_dict.get('SeriesGenres', [])
@@ -165,9 +160,6 @@ class Trailer(Video):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
-
 
 class AdultVideo(Video):
     '''Class representing adult vidoe objects
@@ -179,9 +171,6 @@ class AdultVideo(Video):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
-
 
 class MusicVideo(Video):
     '''Class representing music video objects
@@ -193,5 +182,3 @@ class MusicVideo(Video):
       connector : embypy.utils.connector.Connector
         same as for `EmbyObject`
     '''
-    def __init__(self, object_dict, connector):
-        super().__init__(object_dict, connector)
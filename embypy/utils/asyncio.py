@@ -1,6 +1,7 @@
 import asyncio
 import inspect
 import threading
+import warnings
 
 
 _loop_lock = threading.RLock()
@@ -19,6 +20,36 @@ def is_asyncio_context() -> bool:
             return False
 
 
+def enable_uvloop() -> bool:
+    '''use uvloop for new event loops, if it is installed
+
+    Returns
+    -------
+    bool
+      True if uvloop was installed as the event loop policy
+
+    Notes
+    -----
+    Some debuggers do not work with uvloop, so this is opt-in.
+
+    This has to be called before the event loop is started, a loop that
+    is already running can not be switched (a warning is issued instead).
+    '''
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    if is_asyncio_context():
+        warnings.warn(
+            'enable_uvloop called from a running event loop, it has no effect',
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 def async_func(func):
     def tmp_func(*args, **kargs):
         return _run_func(func, *args, **kargs)
@@ -1,13 +1,20 @@
 import json
 from requests.compat import urlparse, urlunparse, urlencode
 import asyncio
+from contextlib import asynccontextmanager
 import aiohttp
+import ijson
+import orjson
 import websockets
 import ssl
 
 from embypy import __version__
 from embypy.utils.asyncio import async_func
 
+# newer pythons close aborted ssl transports themselves, aiohttp then
+#   ignores (and warns about) enable_cleanup_closed
+_CLEANUP_CLOSED = getattr(aiohttp.connector, 'NEEDS_CLEANUP_CLOSED', True)
+
 
 class WebSocket:
     '''Basic websocet that runs function when messages are recived
@@ -95,8 +102,13 @@ class Connector:
       device id as registered in emby
     timeout : int
       number of seconds to wait before timeout for a request
+    session : aiohttp.ClientSession, optional
+      session to make requests with, by default one is created
+      (per event loop) and kept open until `close` is called
     tries : int
       number of times to try a request before throwing an error
+    concurrency : int
+      max number of requests to send at once (default 16)
     jellyfin : bool
       if this is a jellyfin (false = emby) server
 
@@ -137,14 +149,24 @@ class Connector:
         self.device_id	= kargs.get('device_id', 'EmbyPy')
         self.timeout	= kargs.get('timeout', 30)
         self.tries	= kargs.get('tries', 3)
+        self.concurrency	= kargs.get('concurrency') or 16
         self.jellyfin	= kargs.get('jellyfin')
         self.url	= urlparse(url)
         self.urlremote	= urlparse(urlremote) if urlremote else urlremote
 
+        # scheme://host:port, for urls that need no query string
+        self._base_url = '{0.scheme}://{0.netloc}'.format(self.url)
+        self._base_url_remote = '{0.scheme}://{0.netloc}'.format(
+            self.urlremote or self.url
+        )
+
         self.attempt_login = False
-        self._session_locks = {}
-        self._session_uses = {}
+        self._session = kargs.get('session')
         self._sessions = {}
+        self._semaphores = {}
+        self._client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+        self._lookups = {}
+        self._build_headers()
 
         if self.ssl and type(self.ssl) == str:
             self.ssl = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
@@ -166,9 +188,7 @@ class Connector:
             return self.__getattr__(name[:-5])
         return self.__getattribute__(name)
 
-    async def _get_session(self):
-        loop = asyncio.get_running_loop()
-        loop_id = hash(loop)
+    def _build_headers(self):
         auth_header = 'MediaBrowser Client="{0}",Device="{0}",' \
                       'DeviceId="{1}",Version="{2}"'
         auth_header = auth_header.format('EmbyPy', self.device_id, __version__)
@@ -176,6 +196,7 @@ class Connector:
             auth_header += f',Token="{self.token}"'
 
         headers = {
+            'Accept': 'application/json',
             'Authorization': auth_header,
             'X-Emby-Authorization': auth_header,
         }
@@ -183,33 +204,74 @@ class Connector:
         if self.token:
             headers.update({'X-MediaBrowser-Token': self.token})
 
-        async with await self._get_session_lock():
-            session = self._sessions.get(loop_id)
-            if not session:
-                session = aiohttp.ClientSession(
-                    headers=headers,
-                    connector=aiohttp.TCPConnector(ssl_context=self.ssl),
-                )
-                self._sessions[loop_id] = session
-                self._session_uses[loop_id] = 1
-            else:
-                self._session_uses[loop_id] += 1
-            return session
+        self._headers = headers
 
-    async def _end_session(self):
+    async def _get_session(self):
+        # a user supplied session is shared as-is, its lifetime is theirs
+        if self._session:
+            return self._session
+
+        # sessions are keyed by their loop (a hash could be reused by a new
+        #   loop), sessions of finished loops can't be used or closed anymore
         loop = asyncio.get_running_loop()
-        loop_id = hash(loop)
-        async with await self._get_session_lock():
-            self._session_uses[loop_id] -= 1
-            session = self._sessions.get(loop_id)
-            if session and self._session_uses[loop_id] <= 0:
-                await session.close()
-                self._sessions[loop_id] = None
-
-    async def _get_session_lock(self):
+        for old in [l for l in self._sessions if l.is_closed()]:
+            del self._sessions[old]
+        session = self._sessions.get(loop)
+        if not session or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl_context=self.ssl,
+                    limit=100,
+                    limit_per_host=20,
+                    # stay under the usual 75s idle timeout of the server
+                    #   (or proxy), so a pooled connection is never reused
+                    #   just as the other side drops it
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=_CLEANUP_CLOSED,
+                    ttl_dns_cache=300,
+                ),
+                timeout=self._client_timeout,
+            )
+            self._sessions[loop] = session
+        return session
+
+    def _get_semaphore(self):
+        # keyed by the loop itself, a hash could be reused by a new loop
         loop = asyncio.get_running_loop()
-        self._sessions[loop] = None
-        return self._session_locks.setdefault(loop, asyncio.Lock(loop=loop))
+        for old in [l for l in self._semaphores if l.is_closed()]:
+            del self._semaphores[old]
+        semaphore = self._semaphores.get(loop)
+        if not semaphore:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    @async_func
+    async def close(self):
+        '''close the http sessions opened by this connector
+
+        |coro|
+
+        Notes
+        -----
+        A session passed in through the `session` argument is left open,
+        it belongs to the caller.
+        '''
+        sessions = [
+            session for loop, session in self._sessions.items()
+            if not loop.is_closed() and not session.closed
+        ]
+        self._sessions = {}
+        for session in sessions:
+            await session.close()
+
+    @async_func
+    async def aclose(self):
+        '''same as close
+
+        |coro|
+        '''
+        await self.close()
 
     @async_func
     async def info(self):
@@ -258,14 +320,7 @@ class Connector:
             self.token = data.get('AccessToken', '')
             self.userid = data.get('User', {}).get('Id')
             self.api_key = self.token
-
-            session = await self._get_session()
-            auth_header = session._default_headers['X-Emby-Authorization']
-            auth_header += f',Token="{self.token}"'
-            session._default_headers['X-MediaBrowser-Token'] = self.token
-            session._default_headers['Authorization'] = auth_header
-            session._default_headers['X-Emby-Authorization'] = auth_header
-            await self._end_session()
+            self._build_headers()
         finally:
             self.attempt_login = False
 
@@ -312,6 +367,18 @@ class Connector:
         if pass_uid:
             query['userId'] = userId
 
+        if not query and not websocket:
+            base = self._base_url_remote if remote else self._base_url
+            if path and path[0] != '/':
+                path = '/' + path
+            if '{' in path:
+                path = path.format(
+                    UserId	= userId,
+                    ApiKey	= self.api_key,
+                    DeviceId	= self.device_id,
+                )
+            return base + path
+
         if remote:
             url = self.urlremote or self.url
         else:
@@ -333,46 +400,70 @@ class Connector:
 
         return url[:-1] if url[-1] == '?' else url
 
-    @async_func
-    async def _process_resp(self, resp):
-        if (not resp or resp.status == 401) and self.username:
-            await self.login()
-            return False
-        return True
+    @staticmethod
+    async def _unexpected_output(resp):
+        return RuntimeError(
+            'Unexpected JSON output (status: {}): "{}"'.format(
+                resp.status,
+                await resp.text(),
+            )
+        )
 
     @staticmethod
     @async_func
     async def resp_to_json(resp):
-        try:
-            return await resp.json()
-        except aiohttp.client_exceptions.ContentTypeError:
-            raise RuntimeError(
-                'Unexpected JSON output (status: {}): "{}"'.format(
-                    resp.status,
-                    await resp.text(),
-                )
-            )
+        raw = await resp.read()
+        if not raw.strip():
+            return None
+        if 'json' not in resp.content_type:
+            raise await Connector._unexpected_output(resp)
+        return orjson.loads(raw)
 
     def add_on_message(self, func):
         '''add function that handles websocket messages'''
         return self.ws.on_message.append(func)
 
-    @async_func
+    @asynccontextmanager
     async def _req(self, method, path, params={}, **query):
+        '''[for internal use] send a request, the response is released
+        (and its slot of `concurrency` freed) when the context exits
+        '''
         await self.login_if_needed()
+        semaphore = self._get_semaphore()
         for i in range(self.tries):
             url = self.get_url(path, **query)
+            await semaphore.acquire()
             try:
-                resp = await method(url, timeout=self.timeout, **params)
-                if await self._process_resp(resp):
-                    return resp
-                else:
-                    continue
+                resp = await method(
+                    url,
+                    timeout=self._client_timeout,
+                    headers=self._headers,
+                    **params
+                )
             except aiohttp.ClientConnectionError:
-                pass
-        raise aiohttp.ClientConnectionError(
-            'Emby server is probably down'
-        )
+                semaphore.release()
+                continue
+            except BaseException:
+                semaphore.release()
+                raise
+
+            if resp.status == 401 and self.username:
+                # free the slot first, logging in makes its own request
+                resp.release()
+                semaphore.release()
+                await self.login()
+                continue
+            break
+        else:
+            raise aiohttp.ClientConnectionError(
+                'Emby server is probably down'
+            )
+
+        try:
+            yield resp
+        finally:
+            resp.release()
+            semaphore.release()
 
     @async_func
     async def get(self, path, **query):
@@ -395,16 +486,13 @@ class Connector:
         requests.models.Response
           the response that was given
         '''
-        try:
-            session = await self._get_session()
-            async with await self._req(
-                session.get,
-                path,
-                **query
-            ) as resp:
-                return resp.status, await resp.text()
-        finally:
-            await self._end_session()
+        session = await self._get_session()
+        async with self._req(
+            session.get,
+            path,
+            **query
+        ) as resp:
+            return resp.status, await resp.text()
 
     @async_func
     async def delete(self, path, **query):
@@ -426,16 +514,13 @@ class Connector:
         requests.models.Response
           the response that was given
         '''
-        try:
-            session = await self._get_session()
-            async with await self._req(
-                session.delete,
-                path,
-                **query
-            ) as resp:
-                return resp.status
-        finally:
-            await self._end_session()
+        session = await self._get_session()
+        async with self._req(
+            session.delete,
+            path,
+            **query
+        ) as resp:
+            return resp.status
 
     @async_func
     async def post(self, path, data={}, send_raw=False, **query):
@@ -523,24 +608,21 @@ class Connector:
         requests.models.Response
           the response that was given
         '''
-        try:
-            session = await self._get_session()
-            if send_raw:
-                params = {"json": data}
+        session = await self._get_session()
+        if send_raw:
+            params = {"json": data}
+        else:
+            params = {"data": json.dumps(data)}
+        async with self._req(
+            session.post,
+            path,
+            params=params,
+            **query
+        ) as resp:
+            if return_json:
+                return await Connector.resp_to_json(resp)
             else:
-                params = {"data": json.dumps(data)}
-            async with await self._req(
-                session.post,
-                path,
-                params=params,
-                **query
-            ) as resp:
-                if return_json:
-                    return await Connector.resp_to_json(resp)
-                else:
-                    return resp.status, await resp.text()
-        finally:
-            await self._end_session()
+                return resp.status, await resp.text()
 
     @async_func
     async def getJson(self, path, **query):
@@ -563,13 +645,45 @@ class Connector:
         dict
           the response content as a dict
         '''
-        try:
-            session = await self._get_session()
-            async with await self._req(
-                session.get,
-                path,
-                **query
-            ) as resp:
-                return await Connector.resp_to_json(resp)
-        finally:
-            await self._end_session()
+        session = await self._get_session()
+        async with self._req(
+            session.get,
+            path,
+            **query
+        ) as resp:
+            return await Connector.resp_to_json(resp)
+
+    async def stream_items(self, path, prefix='Items.item', **query):
+        '''get request, yields json objects as they are parsed
+
+        Parameters
+        ----------
+        path : str
+          same as get_url
+        prefix : str
+          ijson prefix of the objects to yield (default `Items.item`)
+        query : kargs dict
+          additional info to pass to get_url
+
+        See Also
+        --------
+          get_url :
+          getJson :
+
+        Yields
+        ------
+        dict
+          each object found under `prefix`, the full response is never
+          loaded into memory at once
+        '''
+        session = await self._get_session()
+        async with self._req(
+            session.get,
+            path,
+            **query
+        ) as resp:
+            if 'json' not in resp.content_type:
+                raise await Connector._unexpected_output(resp)
+            items = ijson.items_async(resp.content, prefix, use_float=True)
+            async for item in items:
+                yield item